@@ -1,14 +1,16 @@
-import os, sys, time, logging, pathlib, threading, subprocess, psutil, mss, json, comtypes
+import os, sys, time, logging, pathlib, threading, subprocess, queue, psutil, mss, mss.tools, json, comtypes, waitress
 import sounddevice as sd
 from functools import partial
-from datetime import datetime, timedelta
 from functools import wraps
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple, Union
 from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image, ImageDraw
-from flask import Flask, render_template, request, redirect, url_for, session, jsonify
+from flask import Flask, Response, render_template, request, redirect, url_for, session, jsonify
 from pystray import Icon, MenuItem, Menu
 from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+from pycaw.callbacks import MMNotificationClient, AudioEndpointVolumeCallback
+from pycaw.constants import EDataFlow, ERole
 
 class Config:
     if getattr(sys, "frozen", False):  # Running as PyInstaller .exe
@@ -44,6 +46,8 @@ class Config:
         with open(self.CONFIG_FILE, "r") as f: config_data = json.load(f)
         for key, value in self.DEFAULTS.items(): setattr(self, key, config_data.get(key, value))
 
+MODIFIER_MAP = {"alt": "alt", "ctrl": "leftctrl", "shift": "leftshift"}
+
 @contextmanager
 def audio_context():
     try:
@@ -52,21 +56,57 @@ def audio_context():
     finally:
         comtypes.CoUninitialize()
 
+class DefaultDeviceListener(MMNotificationClient):
+    def __init__(self, owner):
+        super().__init__()
+        self.owner = owner
+
+    def on_default_device_changed(self, flow, flow_id, role, role_id, default_device_id):
+        if role_id == ERole.eConsole.value:  # fires once per role; rebuild only once per switch
+            self.owner._on_default_device_changed()
+
+class VolumeChangeListener(AudioEndpointVolumeCallback):
+    def __init__(self, owner):
+        super().__init__()
+        self.owner = owner
+
+    def on_notify(self, *args):
+        self.owner._wake_status_monitor()
+
 class PCRemoteControl:
     def __init__(self):
         self.config = Config()
         self._setup_logging()
         self.nircmd = os.path.join(self.config.STATIC_DIR, "nircmd.exe")
         self.running_apps_cache: Dict[str, Any] = {}
-        self.last_cache_update: datetime = datetime.min
-        self.cache_ttl = timedelta(seconds=2)
+        self.last_cache_update: float = 0.0
+        self.cache_ttl = 2.0  # seconds
         self.app_enabled = True
-        self.request_counts: Dict[str, List[datetime]] = {}
-        self.modifier_key_timer: threading.Timer = None
-        self.active_modifier: str = None
+        self.rate_buckets: Dict[str, Tuple[float, float]] = {}  # ip -> (tokens, last_refill)
+        self._last_bucket_sweep: float = time.monotonic()
         self.active_modifiers: set = set()
+        self._modifier_deadline: float = 0.0
+        self._modifier_event = threading.Event()
+        threading.Thread(target=self._modifier_watchdog, daemon=True).start()
         self.pictures_dir = pathlib.Path.home() / "Pictures" / "Remote Screenshots"
+        self._screenshot_executor = ThreadPoolExecutor(max_workers=1)
+        self._default_output_name: str = None
+        self._stream_subscribers: List[queue.Queue] = []
+        self._stream_lock = threading.Lock()
+        self._status_changed = threading.Event()
+        self._status_monitor_started = False
+        self._volume_listener = VolumeChangeListener(self)
+        self._build_audio_interfaces()
+        try:
+            self._device_listener = DefaultDeviceListener(self)
+            with audio_context():
+                # keep the enumerator on self so the registration stays alive
+                self._notify_enumerator = AudioUtilities.GetDeviceEnumerator()
+                self._notify_enumerator.RegisterEndpointNotificationCallback(self._device_listener)
+        except Exception as e:
+            self.logger.error(f"Could not register device-change callback: {e}")
         self.apps = self._define_apps()
+        self._actions = self._define_actions()
         self.flask_app = self._create_flask_app()
 
     def _setup_logging(self):
@@ -76,7 +116,7 @@ class PCRemoteControl:
         self.logger = logging.getLogger(__name__)
 
     def _define_apps(self) -> Dict[str, Dict[str, str]]:
-        return {
+        apps = {
         "discord": {"exe": "Discord.exe", "process_name": "discord.exe", "cmd": f'"{pathlib.Path.home() / "AppData/Local/Discord/Update.exe"}" --processStart Discord.exe', "closable": True},
         "steam": {"exe": "steam.exe", "process_name": "steam.exe", "cmd": str(pathlib.Path("C:/Program Files (x86)/Steam/Steam.exe")), "closable": True},
         "npp": {"exe": "notepad++.exe", "process_name": "notepad++.exe", "cmd": "start notepad++", "closable": True},
@@ -84,21 +124,87 @@ class PCRemoteControl:
         "mediaplayer": {"exe": "mediaplayer.exe", "process_name": "mediaplayer.exe", "cmd": "start mediaplayer", "closable": True},
         "task_manager": {"exe": "Taskmgr.exe", "process_name": "taskmgr.exe", "cmd": "taskmgr", "closable": False},
         }
+        for app_config in apps.values():
+            app_config["process_name_lower"] = app_config.get("process_name", app_config["exe"]).lower()
+        return apps
+
+    def _define_actions(self) -> Dict[str, Any]:
+        return {
+        'media_play_pause':   partial(self._create_simple_response,    [self.nircmd, 'sendkeypress', '0xB3'],                                 "Media play/pause toggled"),
+        'media_next':         partial(self._create_simple_response,    [self.nircmd, 'sendkeypress', '0xB0'],                                 "Skipped to next track"),
+        'media_previous':     partial(self._create_simple_response,    [self.nircmd, 'sendkeypress', '0xB1'],                                 "Skipped to previous track"),
+        'undo':               partial(self._create_simple_response,    [self.nircmd, 'sendkeypress', 'leftctrl+z'],                           "Undo (Ctrl+Z)"),
+        'redo':               partial(self._create_simple_response,    [self.nircmd, 'sendkeypress', 'leftctrl+y'],                           "Redo (Ctrl+Y)"),
+        'sleep':              partial(self._create_simple_response,    [self.nircmd, 'standby'],                                              "System sleep initiated"),
+        'hard_sleep':         partial(self._create_simple_response,    ['rundll32.exe', 'powrprof.dll,SetSuspendState', '0,1,0'],            "System hard sleep initiated"),
+        'shutdown':           partial(self._create_simple_response,    ['shutdown', '/s', '/t', '5'],                                         "System shutdown initiated"),
+        'restart':            partial(self._create_simple_response,    ['shutdown', '/r', '/t', '5'],                                         "System restart initiated"),
+        'lock':               partial(self._create_simple_response,    ['rundll32.exe', 'user32.dll,LockWorkStation'],                        "Workstation locked"),
+        'mute_toggle_sound':  partial(self._create_simple_response,    [self.nircmd, 'mutesysvolume', '2'],                                  "System volume mute toggled"),
+        'mute_toggle_mic':    partial(self._create_simple_response,    [self.nircmd, 'mutesysvolume', '2', self.config.RECORDING_DEVICE_1],  "Microphone mute toggled"),
+
+        'arrow_left':         partial(self._handle_standard_key_press, "left",                                                                "Left"),
+        'arrow_up':           partial(self._handle_standard_key_press, "up",                                                                  "Up"),
+        'arrow_right':        partial(self._handle_standard_key_press, "right",                                                               "Right"),
+        'arrow_down':         partial(self._handle_standard_key_press, "down",                                                                "Down"),
+
+        'press_enter':        partial(self._handle_standard_key_press, "enter",                                                               "Enter"),
+        'press_space':        partial(self._handle_standard_key_press, "spc",                                                                 "Space"),
+        'press_esc':          partial(self._handle_standard_key_press, "esc",                                                                 "Esc"),
+        'press_backspace':    partial(self._handle_standard_key_press, "backspace", "Backspace"),
+        'press_win':          partial(self._handle_standard_key_press, "lwin",                                                                "Window"),
+        'press_tab':          partial(self._handle_standard_key_press, "tab",                                                                 "Tab"),
+        'press_del':          partial(self._handle_standard_key_press, "delete",                                                                 "Delete"),
+        'press_f4':           partial(self._handle_standard_key_press, "f4",                                                                  "F4"),
+        'press_f5':           partial(self._handle_standard_key_press, "f5",                                                                  "F5"),
+
+        'press_alt':          partial(self._handle_modifier_press,     "alt"),
+        'press_ctrl':         partial(self._handle_modifier_press,     "ctrl"),
+        'press_shift':        partial(self._handle_modifier_press,     "shift"),
+
+        'screenshot':       self._take_screenshot,
+        'audio_device_toggle': self._toggle_audio_device,
+        }
 
     def _update_running_apps_cache(self, force: bool = False):
-        if not force and datetime.now() - self.last_cache_update < self.cache_ttl: return
+        if not force and time.monotonic() - self.last_cache_update < self.cache_ttl: return
+        try:
+            # One tasklist fork is far cheaper than psutil's per-PID syscalls, especially non-admin
+            result = subprocess.run(["tasklist", "/nh", "/fo", "csv"], capture_output=True, text=True, timeout=10, creationflags=subprocess.CREATE_NO_WINDOW)
+            if result.returncode != 0: raise RuntimeError(result.stderr)
+            self.running_apps_cache = frozenset(line.split(",", 1)[0].strip('"').lower() for line in result.stdout.splitlines() if line)
+            self.last_cache_update = time.monotonic()
+        except Exception:
+            try:
+                if force and hasattr(psutil.process_iter, "cache_clear"):
+                    psutil.process_iter.cache_clear()  # psutil >= 6.0 reuses Process objects across calls
+                self.running_apps_cache = {p.info['name'].lower() for p in psutil.process_iter(['name']) if p.info['name']}
+                self.last_cache_update = time.monotonic()
+            except Exception: pass
+
+    def _is_process_running(self, process_name: str) -> bool:
         try:
-            self.running_apps_cache = {p.info['name'].lower() for p in psutil.process_iter(['name']) if p.info['name']}
-            self.last_cache_update = datetime.now()
+            for p in psutil.process_iter(['name']):
+                if p.info['name'] and p.info['name'].lower() == process_name:
+                    return True
         except Exception: pass
+        return False
     # ----------------------- Rate Limiting -----------------------
+    def _sweep_idle_buckets(self, now: float):
+        self.rate_buckets = {ip: bucket for ip, bucket in self.rate_buckets.items() if now - bucket[1] < 60.0}
+        self._last_bucket_sweep = now
+
     def _rate_limit_check(self, client_ip: str) -> bool:
-        now = datetime.now()
-        self.request_counts.setdefault(client_ip, [])
-        self.request_counts[client_ip] = [t for t in self.request_counts[client_ip] if t > now - timedelta(minutes=1)]
-        if len(self.request_counts[client_ip]) >= self.config.MAX_REQUESTS_PER_MINUTE:
+        now = time.monotonic()
+        if now - self._last_bucket_sweep > 60.0:
+            self._sweep_idle_buckets(now)
+        limit = self.config.MAX_REQUESTS_PER_MINUTE
+        tokens, last_refill = self.rate_buckets.get(client_ip, (float(limit), now))
+        tokens = min(float(limit), tokens + (now - last_refill) * limit / 60.0)
+        if tokens < 1.0:
+            self.rate_buckets[client_ip] = (tokens, now)
             return False
-        self.request_counts[client_ip].append(now)
+        self.rate_buckets[client_ip] = (tokens - 1.0, now)
         return True
     # ----------------------- Rate Limiting -----------------------
     # ----------------------- Flask Routes -----------------------
@@ -107,23 +213,27 @@ class PCRemoteControl:
                     # template_folder=self.config.TEMPLATE_DIR,
                     static_folder=self.config.STATIC_DIR)
         app.secret_key = self.config.SECRET_KEY
+        app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 86400  # let browsers cache static assets for a day
 
         @app.before_request
         def before_request():
-            self.logger.debug(f"Request: {request.method} {request.path}")
+            if request.endpoint == "static":
+                return None  # assets skip logging, the enabled check and rate limiting
 
-            if not self.app_enabled and request.endpoint not in ("static",):
+            self.logger.debug("Request: %s %s", request.method, request.path)
+
+            if not self.app_enabled:
                 return jsonify(error="App is disabled from system tray"), 503
 
             if not self._rate_limit_check(request.remote_addr):
-                self.logger.warning(f"Rate limit exceeded for {request.remote_addr}")
+                self.logger.warning("Rate limit exceeded for %s", request.remote_addr)
                 return jsonify(error="Rate limit exceeded"), 429
 
             if 'logged_in' in session and 'last_activity' in session:
-                if datetime.now() - datetime.fromisoformat(session['last_activity']) > timedelta(minutes=self.config.SESSION_TIMEOUT):
+                if time.time() - session['last_activity'] > self.config.SESSION_TIMEOUT_MINUTES * 60:
                     session.clear()
                     return redirect(url_for('login'))
-                session['last_activity'] = datetime.now().isoformat()
+                session['last_activity'] = time.time()
         
         def login_required(f):
             @wraps(f)
@@ -141,6 +251,7 @@ class PCRemoteControl:
         def login():
             if request.method == "POST" and request.form.get("username") == self.config.USERNAME and request.form.get("password") == self.config.PASSWORD:
                 session["logged_in"] = True
+                session["last_activity"] = time.time()
                 return redirect(url_for("index"))
             return render_template("login.html")
 
@@ -152,62 +263,40 @@ class PCRemoteControl:
         @app.route("/api/status/all")
         @login_required
         def get_all_status():
-            self._update_running_apps_cache(force=True)
-            app_statuses = {}
-            for app_key, app_config in self.apps.items():
-                process_name = app_config.get('process_name', app_config['exe']).lower()
-                app_statuses[app_key] = process_name in self.running_apps_cache
+            return jsonify(self._collect_status())
 
-            return jsonify({
-                "apps": app_statuses,
-                "volume": self._get_volume(),
-                "muted_state": self._get_mute_states()
-            })
+        @app.route("/api/stream")
+        @login_required
+        def stream():
+            self._ensure_status_monitor()
+            subscriber = queue.Queue(maxsize=4)
+            with self._stream_lock:
+                self._stream_subscribers.append(subscriber)
+            initial = self._collect_status()
+
+            def event_stream():
+                try:
+                    yield f"data: {json.dumps(initial)}\n\n"
+                    while True:
+                        try:
+                            yield f"data: {json.dumps(subscriber.get(timeout=15.0))}\n\n"
+                        except queue.Empty:
+                            yield ": keep-alive\n\n"
+                finally:
+                    with self._stream_lock:
+                        self._stream_subscribers.remove(subscriber)
+
+            return Response(event_stream(), mimetype="text/event-stream")
 
         @app.route("/api/action/<action_name>", methods=["POST"])
         @login_required
         def handle_action(action_name):
-            actions = {
-                'media_play_pause':   partial(self._create_simple_response,    f'"{self.nircmd}" sendkeypress 0xB3',                                  "Media play/pause toggled"),
-                'media_next':         partial(self._create_simple_response,    f'"{self.nircmd}" sendkeypress 0xB0',                                  "Skipped to next track"),
-                'media_previous':     partial(self._create_simple_response,    f'"{self.nircmd}" sendkeypress 0xB1',                                  "Skipped to previous track"),
-                'undo':               partial(self._create_simple_response,    f'"{self.nircmd}" sendkeypress leftctrl+z',                               "Undo (Ctrl+Z)"),
-                'redo':               partial(self._create_simple_response,    f'"{self.nircmd}" sendkeypress leftctrl+y',                               "Redo (Ctrl+Y)"),
-                'sleep':              partial(self._create_simple_response,    f'"{self.nircmd}" standby',                                            "System sleep initiated"),
-                'hard_sleep':         partial(self._create_simple_response,    'rundll32.exe powrprof.dll,SetSuspendState 0,1,0',                     "System hard sleep initiated"),
-                'shutdown':           partial(self._create_simple_response,    'shutdown /s /t 5',                                                    "System shutdown initiated"),
-                'restart':            partial(self._create_simple_response,    'shutdown /r /t 5',                                                    "System restart initiated"),
-                'lock':               partial(self._create_simple_response,    'rundll32.exe user32.dll,LockWorkStation',                             "Workstation locked"),
-                'mute_toggle_sound':  partial(self._create_simple_response,    f'"{self.nircmd}" mutesysvolume 2',                                    "System volume mute toggled"),
-                'mute_toggle_mic':    partial(self._create_simple_response,    f'"{self.nircmd}" mutesysvolume 2 "{self.config.RECORDING_DEVICE_1}"', "Microphone mute toggled"),
-                  
-                'arrow_left':         partial(self._handle_standard_key_press, "left",                                                                "Left"),
-                'arrow_up':           partial(self._handle_standard_key_press, "up",                                                                  "Up"),
-                'arrow_right':        partial(self._handle_standard_key_press, "right",                                                               "Right"),
-                'arrow_down':         partial(self._handle_standard_key_press, "down",                                                                "Down"),
-  
-                'press_enter':        partial(self._handle_standard_key_press, "enter",                                                               "Enter"),
-                'press_space':        partial(self._handle_standard_key_press, "spc",                                                                 "Space"),
-                'press_esc':          partial(self._handle_standard_key_press, "esc",                                                                 "Esc"),
-                'press_backspace':    partial(self._handle_standard_key_press, "backspace", "Backspace"),
-                'press_win':          partial(self._handle_standard_key_press, "lwin",                                                                "Window"),
-                'press_tab':          partial(self._handle_standard_key_press, "tab",                                                                 "Tab"),
-                'press_del':          partial(self._handle_standard_key_press, "delete",                                                                 "Delete"),
-                'press_f4':           partial(self._handle_standard_key_press, "f4",                                                                  "F4"),
-                'press_f5':           partial(self._handle_standard_key_press, "f5",                                                                  "F5"),
-  
-                'press_alt':          partial(self._handle_modifier_press,     "alt"),
-                'press_ctrl':         partial(self._handle_modifier_press,     "ctrl"),
-                'press_shift':        partial(self._handle_modifier_press,     "shift"),
-
-                'screenshot':       self._take_screenshot,
-                'audio_device_toggle': self._toggle_audio_device,
-            }
-            if action_name in actions:
-                response_data = actions[action_name]()
+            action = self._actions.get(action_name)
+            if action:
+                response_data = action()
                 response_data["state"] = self._get_mute_states()
                 return jsonify(response_data)
-        
+
             return jsonify({"success": False, "message": "Invalid action"})
 
         @app.route("/api/app/<app_name>/toggle", methods=["POST"])
@@ -217,11 +306,10 @@ class PCRemoteControl:
             if not app_config: return jsonify({"success": False, "message": "App not configured"})
 
             display_name = app_name.title()
-            process_name = app_config.get('process_name', app_config['exe']).lower()
+            process_name = app_config["process_name_lower"]
             is_closable = app_config.get("closable", True)
-        
-            self._update_running_apps_cache(force=True)
-            is_running = process_name in self.running_apps_cache
+
+            is_running = self._is_process_running(process_name)
             if is_running:
                 if not is_closable:
                     return jsonify({
@@ -230,7 +318,7 @@ class PCRemoteControl:
                         "running": True
                     })
 
-                success = self._execute_command(f'taskkill /F /IM "{app_config["exe"]}"')
+                success = self._execute_command(["taskkill", "/F", "/IM", app_config["exe"]])
                 message = f"{display_name} closed." if success else f"Failed to close {display_name}."
             else:
                 try:
@@ -241,7 +329,6 @@ class PCRemoteControl:
                     success = False
                     message = f"Failed to start {display_name}: {str(e)}"
             time.sleep(0.5)
-            self._update_running_apps_cache(force=True)
             return jsonify({
                 "success": success,
                 "message": message,
@@ -256,91 +343,85 @@ class PCRemoteControl:
         return app
     # ----------------------- Flask Routes -----------------------
     # ----------------------- Executaion -----------------------
-    def _create_simple_response(self, command: str, success_message: str) -> Dict[str, Any]:
+    def _create_simple_response(self, command: Union[str, List[str]], success_message: str) -> Dict[str, Any]:
         success = self._execute_command(command)
+        failed_exe = command[0] if isinstance(command, list) else command.split()[0]
         return {
             "success": success,
-            "message": success_message if success else f"Failed to execute: {command.split()[0]}"
+            "message": success_message if success else f"Failed to execute: {failed_exe}"
         }
 
-    def _execute_command(self, command: str) -> bool:
+    def _execute_command(self, command: Union[str, List[str]]) -> bool:
         try:
             startupinfo = subprocess.STARTUPINFO()
             startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
             result = subprocess.run(
                 command,
-                shell=True,
+                shell=isinstance(command, str),  # argv lists skip the cmd.exe middleman
                 capture_output=True,
                 text=True,
                 timeout=10,
                 startupinfo=startupinfo,
+                creationflags=subprocess.CREATE_NO_WINDOW,
                 check=False
             )
             return result.returncode == 0
         except Exception:
             return False
         
-    def _handle_arrow(self, key_code: str, message: str) -> Dict[str, Any]:
-        return self._create_simple_response(f'"{self.nircmd}" sendkeypress {key_code}', message)
     # ----------------------- Executaion -----------------------
     # ----------------------- Alt Ctrl Shift Tab -----------------------
-    def _reset_alt_tab_timer_if_active(self):
-        if self.alt_tab_timer and self.alt_tab_timer.is_alive():
-            self.alt_tab_timer.cancel()
-    
-            def cleanup_action():
-                self._execute_command(f'"{self.nircmd}" sendkey 0xA4 up')  # Alt up
-                self.alt_tab_timer = None
-                self.logger.info("Alt-Tab session timed out after an interaction.")
-    
-            self.alt_tab_timer = threading.Timer(2.1, cleanup_action)
-            self.alt_tab_timer.start()
-            self.logger.info("Alt-Tab timer reset.")
-            
     def _clear_modifier_state(self):
-        MODIFIER_MAP = {"alt": "alt", "ctrl": "leftctrl", "shift": "leftshift"}
-        for modifier in self.active_modifiers:
-            self._execute_command(f'"{self.nircmd}" sendkey {MODIFIER_MAP[modifier]} up')
-
-        if self.modifier_key_timer and self.modifier_key_timer.is_alive():
-            self.modifier_key_timer.cancel()
+        if self.active_modifiers:
+            release = [self.nircmd]
+            for modifier in self.active_modifiers:
+                release += ["sendkey", MODIFIER_MAP[modifier], "up"]
+            self._execute_command(release)  # one nircmd invocation releases them all
 
         self.active_modifiers.clear()
-        self.modifier_key_timer = None
+        self._modifier_deadline = 0.0
         self.logger.info("All modifier keys have been released.")
-        
-    def _handle_modifier_press(self, modifier: str) -> Dict[str, Any]:
-        MODIFIER_MAP = {"alt": "alt", "ctrl": "leftctrl", "shift": "leftshift"}
 
-        if self.modifier_key_timer and self.modifier_key_timer.is_alive():
-            self.modifier_key_timer.cancel()
+    def _modifier_watchdog(self):
+        # One long-lived thread replaces a threading.Timer per press
+        while True:
+            self._modifier_event.wait()
+            self._modifier_event.clear()
+            deadline = self._modifier_deadline
+            while deadline:
+                delay = deadline - time.monotonic()
+                if delay <= 0: break
+                self._modifier_event.wait(timeout=delay)
+                self._modifier_event.clear()
+                deadline = self._modifier_deadline
+            if deadline and self.active_modifiers:
+                self._clear_modifier_state()
 
+    def _handle_modifier_press(self, modifier: str) -> Dict[str, Any]:
         if modifier in self.active_modifiers:
             self.active_modifiers.remove(modifier)
-            self._execute_command(f'"{self.nircmd}" sendkey {MODIFIER_MAP[modifier]} up')
+            self._execute_command([self.nircmd, "sendkey", MODIFIER_MAP[modifier], "up"])
             message = f"{modifier.capitalize()} released."
         else:
             self.active_modifiers.add(modifier)
-            self._execute_command(f'"{self.nircmd}" sendkey {MODIFIER_MAP[modifier]} down')
+            self._execute_command([self.nircmd, "sendkey", MODIFIER_MAP[modifier], "down"])
             message = f"{modifier.capitalize()} is active."
 
-        if self.active_modifiers:
-            self.modifier_key_timer = threading.Timer(4.1, self._clear_modifier_state)
-            self.modifier_key_timer.start()
+        self._modifier_deadline = time.monotonic() + 4.1 if self.active_modifiers else 0.0
+        self._modifier_event.set()
         return {"success": True, "message": message, "activeModifiers": list(self.active_modifiers)}
 
     def _handle_standard_key_press(self, key_command: str, message: str) -> Dict[str, Any]:
         time.sleep(0.1)
-        if self.active_modifier:
-            MODIFIER_MAP = {"alt": "alt", "ctrl": "leftctrl", "shift": "leftshift"}
+        if self.active_modifiers:
             modifier_keys = [MODIFIER_MAP[mod] for mod in self.active_modifiers]
             combo = "+".join(modifier_keys)
             
-            full_command = f'"{self.nircmd}" sendkeypress {combo}+{key_command}'
+            full_command = [self.nircmd, "sendkeypress", f"{combo}+{key_command}"]
             success_message = f"Sent {'+'.join([m.capitalize() for m in self.active_modifiers])}+{message}"
             self._clear_modifier_state()
         else:
-            full_command = f'"{self.nircmd}" sendkeypress {key_command}'
+            full_command = [self.nircmd, "sendkeypress", key_command]
             success_message = f"Sent {message}"
     
         success = self._execute_command(full_command)
@@ -351,25 +432,97 @@ class PCRemoteControl:
         }
     # ----------------------- Alt Ctrl Shift Tab -----------------------
     # ----------------------- Audio Device -----------------------
-    def _get_volume(self) -> Dict[str, Any]:
-        try:
-            with audio_context():
+    def _build_audio_interfaces(self):
+        if getattr(self, "_speaker_vol", None):
+            try: self._speaker_vol.UnregisterControlChangeNotify(self._volume_listener)
+            except Exception: pass
+        self._speaker_vol = None
+        self._mic_vol = None
+        self._device_enumerator = None
+        with audio_context():
+            try:
+                self._device_enumerator = AudioUtilities.GetDeviceEnumerator()
+            except Exception as e:
+                self.logger.error(f"Could not build device enumerator: {e}")
+            try:
                 speakers = AudioUtilities.GetSpeakers()
                 interface = speakers.Activate(IAudioEndpointVolume._iid_, comtypes.CLSCTX_ALL, None)
-                volume = interface.QueryInterface(IAudioEndpointVolume)
-                return {"volume": round(volume.GetMasterVolumeLevelScalar() * 100)}
+                self._speaker_vol = interface.QueryInterface(IAudioEndpointVolume)
+                self._speaker_vol.RegisterControlChangeNotify(self._volume_listener)
+            except Exception as e:
+                self.logger.error(f"Could not build speaker volume interface: {e}")
+            try:
+                mic = AudioUtilities.GetMicrophone()
+                interface_mic = mic.Activate(IAudioEndpointVolume._iid_, comtypes.CLSCTX_ALL, None)
+                self._mic_vol = interface_mic.QueryInterface(IAudioEndpointVolume)
+            except Exception as e:
+                self.logger.error(f"Could not build microphone volume interface: {e}")
+
+    def _collect_status(self) -> Dict[str, Any]:
+        self._update_running_apps_cache(force=True)
+        app_statuses = {app_key: app_config["process_name_lower"] in self.running_apps_cache for app_key, app_config in self.apps.items()}
+
+        with audio_context():
+            return {
+                "apps": app_statuses,
+                "volume": self._get_volume(),
+                "muted_state": self._get_mute_states()
+            }
+
+    def _on_default_device_changed(self):
+        self._default_output_name = None
+        self._build_audio_interfaces()
+        self._wake_status_monitor()
+
+    # ----------------------- Status Stream -----------------------
+    def _wake_status_monitor(self):
+        self._status_changed.set()
+
+    def _ensure_status_monitor(self):
+        with self._stream_lock:
+            if self._status_monitor_started: return
+            self._status_monitor_started = True
+        threading.Thread(target=self._status_monitor, daemon=True).start()
+
+    def _status_monitor(self):
+        last_status = None
+        while True:
+            self._status_changed.wait(timeout=2.0)
+            self._status_changed.clear()
+            with self._stream_lock:
+                subscribers = list(self._stream_subscribers)
+            if not subscribers:
+                last_status = None
+                continue
+            try:
+                status = self._collect_status()
+            except Exception as e:
+                self.logger.error(f"Status monitor update failed: {e}")
+                continue
+            if status != last_status:
+                last_status = status
+                for subscriber in subscribers:
+                    try: subscriber.put_nowait(status)
+                    except queue.Full: pass
+    # ----------------------- Status Stream -----------------------
+
+    def _get_default_output_name(self) -> str:
+        if self._default_output_name is None:
+            device = self._device_enumerator.GetDefaultAudioEndpoint(EDataFlow.eRender.value, ERole.eConsole.value)
+            self._default_output_name = AudioUtilities.CreateDevice(device).FriendlyName
+        return self._default_output_name
+
+    def _get_volume(self) -> Dict[str, Any]:
+        try:
+            return {"volume": round(self._speaker_vol.GetMasterVolumeLevelScalar() * 100)}
         except Exception as e:
             self.logger.error(f"Failed to get volume: {e}")
             return {"volume": 50}
 
     def _set_volume(self, value: int):
         try:
-            with audio_context():
-                value = max(0, min(100, value))
-                speakers = AudioUtilities.GetSpeakers()
-                interface = speakers.Activate(IAudioEndpointVolume._iid_, comtypes.CLSCTX_ALL, None)
-                volume = interface.QueryInterface(IAudioEndpointVolume)
-                volume.SetMasterVolumeLevelScalar(value / 100.0, None)
+            value = max(0, min(100, value))
+            self._speaker_vol.SetMasterVolumeLevelScalar(value / 100.0, None)
             return {"success": True, "message": f"Volume set to {value}%"}
         except Exception as e:
             return {"success": False, "message": str(e)}
@@ -381,36 +534,26 @@ class PCRemoteControl:
         is_headphone_active = False
 
         try:
-            sd._terminate()
-            sd._initialize()
-            device_name = sd.query_devices(kind='output')['name'].split(' ')[0]
-            
+            device_name = self._get_default_output_name().split(' ')[0]
+
             headphone_name_from_config = self.config.PLAYBACK_DEVICE_2
             if headphone_name_from_config.lower() in device_name.lower():
                 is_headphone_active = True
 
         except Exception as e:
-            self.logger.error(f"Could not get device name using sounddevice: {e}")
+            self.logger.error(f"Could not get default output device name: {e}")
 
         try:
-            with audio_context():
-                try:
-                    speakers = AudioUtilities.GetSpeakers()
-                    interface = speakers.Activate(IAudioEndpointVolume._iid_, comtypes.CLSCTX_ALL, None)
-                    volume_speaker = interface.QueryInterface(IAudioEndpointVolume)
-                    speaker_muted = bool(volume_speaker.GetMute())
-                except Exception as e:
-                    self.logger.error(f"Could not get speaker mute status using pycaw: {e}")
+            if self._speaker_vol:
+                speaker_muted = bool(self._speaker_vol.GetMute())
+        except Exception as e:
+            self.logger.error(f"Could not get speaker mute status using pycaw: {e}")
 
-                try:
-                    mic = AudioUtilities.GetMicrophone()
-                    interface_mic = mic.Activate(IAudioEndpointVolume._iid_, comtypes.CLSCTX_ALL, None)
-                    volume_mic = interface_mic.QueryInterface(IAudioEndpointVolume)
-                    mic_muted = bool(volume_mic.GetMute())
-                except Exception as e:
-                    self.logger.error(f"Could not get microphone mute status using pycaw: {e}")
+        try:
+            if self._mic_vol:
+                mic_muted = bool(self._mic_vol.GetMute())
         except Exception as e:
-            self.logger.error(f"A general pycaw audio context error occurred: {e}")
+            self.logger.error(f"Could not get microphone mute status using pycaw: {e}")
         return {
             "speaker_muted": speaker_muted,
             "mic_muted": mic_muted,
@@ -419,14 +562,13 @@ class PCRemoteControl:
 
     def _toggle_audio_device(self) -> Dict[str, Any]:
         try:
-            sd._terminate()
-            sd._initialize()
-            current_device = sd.query_devices(kind='output')['name'].split(' ')[0]
+            current_device = self._get_default_output_name().split(' ')[0]
             target_device = self.config.PLAYBACK_DEVICE_2 if current_device == self.config.PLAYBACK_DEVICE_1 else self.config.PLAYBACK_DEVICE_1
             
-            success = self._execute_command(f'"{self.nircmd}" setdefaultsounddevice "{target_device}" 1')
-            
+            success = self._execute_command([self.nircmd, "setdefaultsounddevice", target_device, "1"])
+
             if success:
+                self._on_default_device_changed()  # cached name and endpoints point at the old default device
                 return {"success": True, "message": f"Switched to {target_device}"}
             else:
                 return {"success": False, "message": "Failed to switch audio device"}
@@ -440,12 +582,18 @@ class PCRemoteControl:
             filepath = self.pictures_dir / f"screenshot_{int(time.time())}.png"
             self.pictures_dir.mkdir(parents=True, exist_ok=True)
             with mss.mss() as sct:
-                monitor = sct.monitors[0]
-                img = Image.frombytes("RGB", sct.grab(monitor).size, sct.grab(monitor).rgb)
-                img.save(filepath)
-            return {"success": True, "message": f"Screenshot saved to {filepath.name}"}
+                shot = sct.grab(sct.monitors[0])  # grab once; .size and .rgb come from the same frame
+                rgb, size = shot.rgb, shot.size
+            self._screenshot_executor.submit(self._encode_and_save, rgb, size, filepath)
+            return {"success": True, "message": f"Screenshot queued as {filepath.name}"}
         except Exception as e:
             return {"success": False, "message": str(e)}
+
+    def _encode_and_save(self, rgb: bytes, size, filepath: pathlib.Path):
+        try:
+            mss.tools.to_png(rgb, size, output=str(filepath))
+        except Exception as e:
+            self.logger.error(f"Failed to save screenshot {filepath.name}: {e}")
     # ----------------------- Screen Shot -----------------------
     # ----------------------- System Tray -----------------------
     def _create_tray_image(self, enabled: bool = True) -> Image.Image:
@@ -467,7 +615,10 @@ class PCRemoteControl:
     # ----------------------- System Tray -----------------------
     # ----------------------- Run -----------------------
     def run_flask(self):
-        self.flask_app.run(host=self.config.HOST, port=self.config.PORT, debug=self.config.DEBUG, threaded=True)
+        if self.config.DEBUG:
+            self.flask_app.run(host=self.config.HOST, port=self.config.PORT, debug=True, threaded=True)
+        else:
+            waitress.serve(self.flask_app, host=self.config.HOST, port=self.config.PORT, threads=8)
 
     def run(self):
         try: